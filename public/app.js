@@ -37,6 +37,13 @@ const baseSteps = {
   ],
 };
 
+const badgeClasses = {
+  idle: 'badge idle',
+  running: 'badge running',
+  ok: 'badge ok',
+  fail: 'badge fail',
+};
+
 let currentMode = 'register';
 let stepState = {};
 let sessionData = { loggedIn: false };
@@ -66,18 +73,13 @@ function updateActions() {
 }
 
 function renderSteps() {
-  stepsEl.innerHTML = '';
+  const fragment = document.createDocumentFragment();
   timelineCard.classList.toggle('hidden', Object.keys(stepState).length === 0);
   const steps = baseSteps[currentMode];
   steps.forEach((s) => {
     const status = stepState[s.key]?.status || 'idle';
     const msg = stepState[s.key]?.msg || s.desc;
-    const badgeClass = {
-      idle: 'badge idle',
-      running: 'badge running',
-      ok: 'badge ok',
-      fail: 'badge fail',
-    }[status];
+    const badgeClass = badgeClasses[status];
     const el = document.createElement('div');
     el.className = 'step';
     el.innerHTML = `
@@ -87,8 +89,9 @@ function renderSteps() {
       </div>
       <span class="${badgeClass}">${status}</span>
     `;
-    stepsEl.appendChild(el);
+    fragment.appendChild(el);
   });
+  stepsEl.replaceChildren(fragment);
 }
 
 function setStep(key, status, msg) {
@@ -34,6 +34,12 @@ const modeToUV = {
   preferred: 'preferred',
 };
 
+const pubKeyCredParams = [
+  { type: 'public-key', alg: -8 }, // EdDSA
+  { type: 'public-key', alg: -7 }, // ES256
+  { type: 'public-key', alg: -257 }, // RS256
+];
+
 let currentMode = AUTH_MODE in modeToUV ? AUTH_MODE : 'touch_only';
 
 app.use(
@@ -44,10 +50,10 @@ app.use(
 );
 app.use(express.json({ limit: '1mb' }));
 
-// Disable client caching to ensure fresh UI/CSS
+// Never store API responses; static UI/CSS is always revalidated via ETag/Last-Modified (304 when unchanged)
 app.use((req, res, next) => {
   if (req.method === 'GET') {
-    res.set('Cache-Control', 'no-store');
+    res.set('Cache-Control', req.path.startsWith('/api/') ? 'no-store' : 'no-cache');
   }
   next();
 });
@@ -75,7 +81,8 @@ const validateUsername = (username) => {
   if (typeof username !== 'string') return null;
   const trimmed = username.trim();
   if (!/^[a-zA-Z0-9_-]{1,32}$/.test(trimmed)) return null;
-  return trimmed;
+  // Canonical storage key: lowercase once here so every lookup uses the same key
+  return trimmed.toLowerCase();
 };
 
 // SETTINGS
@@ -111,7 +118,7 @@ app.post('/api/register/options', async (req, res) => {
   const safeName = validateUsername(username);
   if (!safeName) return res.status(400).json({ error: 'Некорректное имя пользователя' });
 
-  const user = await upsertUser(safeName.toLowerCase(), displayName || safeName);
+  const user = await upsertUser(safeName, displayName || username.trim());
 
   const options = generateRegistrationOptions({
     rpName: RP_NAME,
@@ -133,11 +140,7 @@ app.post('/api/register/options', async (req, res) => {
       type: 'public-key',
       transports: cred.transports || ['usb'],
     })),
-    pubKeyCredParams: [
-      { type: 'public-key', alg: -8 },
-      { type: 'public-key', alg: -7 },
-      { type: 'public-key', alg: -257 },
-    ],
+    pubKeyCredParams,
   });
 
   const challenge = options.challenge ?? randomBytes(32);
@@ -149,11 +152,7 @@ app.post('/api/register/options', async (req, res) => {
       name: user.username,
       displayName: user.displayName,
     },
-    pubKeyCredParams: [
-      { type: 'public-key', alg: -8 },  // EdDSA
-      { type: 'public-key', alg: -7 },  // ES256
-      { type: 'public-key', alg: -257 }, // RS256
-    ],
+    pubKeyCredParams,
     excludeCredentials: (options.excludeCredentials || []).map((cred) => ({
       id: toBase64url(cred.id),
       type: cred.type,
@@ -179,10 +178,8 @@ app.post('/api/register/verify', async (req, res) => {
   const safeName = validateUsername(username);
   if (!safeName || !attestationResponse) return res.status(400).json({ error: 'Некорректные данные регистрации' });
 
-  const expectedChallenge = await popChallenge(safeName);
+  const [expectedChallenge, user] = await Promise.all([popChallenge(safeName), getUser(safeName)]);
   if (!expectedChallenge) return res.status(400).json({ error: 'Challenge не найден или просрочен' });
-
-  const user = await getUser(safeName);
   if (!user) return res.status(404).json({ error: 'Пользователь не найден' });
 
   try {
@@ -274,10 +271,8 @@ app.post('/api/login/verify', async (req, res) => {
   const safeName = validateUsername(username);
   if (!safeName || !assertionResponse) return res.status(400).json({ error: 'Некорректные данные авторизации' });
 
-  const expectedChallenge = await popChallenge(safeName);
+  const [expectedChallenge, user] = await Promise.all([popChallenge(safeName), getUser(safeName)]);
   if (!expectedChallenge) return res.status(400).json({ error: 'Challenge не найден или просрочен' });
-
-  const user = await getUser(safeName);
   if (!user || !user.credentials || user.credentials.length === 0) {
     return res.status(404).json({ error: 'Пользователь не найден или нет credential' });
   }
@@ -8,6 +8,13 @@ const __dirname = path.dirname(__filename);
 const dataDir = path.join(__dirname, '..', 'data');
 const usersFile = path.join(dataDir, 'users.json');
 const challengesFile = path.join(dataDir, 'challenges.json');
+const CHALLENGE_TTL_MS = 5 * 60 * 1000;
+
+// Normalized users.json contents, kept for the lifetime of the process.
+// Only this module writes the file, so the copy is refreshed on every write.
+// usersLoad is shared so concurrent callers wait on a single initial read.
+let usersCache = null;
+let usersLoad = null;
 
 async function ensureFiles() {
   await fs.mkdir(dataDir, { recursive: true });
@@ -126,7 +133,30 @@ function normalizeUser(user) {
   return { user: normalized, changed };
 }
 
+async function writeUsers(users) {
+  await writeJson(usersFile, users);
+  usersCache = structuredClone(users);
+}
+
+async function getUsersCache() {
+  usersLoad ??= loadUsersNormalized().then(
+    (users) => {
+      usersCache = users;
+    },
+    (error) => {
+      usersLoad = null;
+      throw error;
+    },
+  );
+  await usersLoad;
+  return usersCache;
+}
+
 async function readUsersNormalized() {
+  return structuredClone(await getUsersCache());
+}
+
+async function loadUsersNormalized() {
   const users = await readJson(usersFile);
   let changed = false;
   const normalizedUsers = {};
@@ -158,14 +188,14 @@ export async function upsertUser(username, displayName) {
       credentials: [],
       createdAt: new Date().toISOString(),
     };
-    await writeJson(usersFile, users);
+    await writeUsers(users);
   }
   return users[username];
 }
 
 export async function getUser(username) {
-  const users = await readUsersNormalized();
-  return users[username] || null;
+  const users = await getUsersCache();
+  return users[username] ? structuredClone(users[username]) : null;
 }
 
 export async function saveUser(user) {
@@ -173,7 +203,7 @@ export async function saveUser(user) {
   const { user: normalizedUser } = normalizeUser(user);
   if (!normalizedUser) return;
   users[normalizedUser.username] = normalizedUser;
-  await writeJson(usersFile, users);
+  await writeUsers(users);
 }
 
 export async function listUsers() {
@@ -181,18 +211,27 @@ export async function listUsers() {
   return Object.values(users);
 }
 
+function isChallengeExpired(entry, now = Date.now()) {
+  // Legacy bare-string entries have no timestamp and count as expired
+  return !entry || !Number.isFinite(entry.ts) || now - entry.ts > CHALLENGE_TTL_MS;
+}
+
 export async function setChallenge(username, challenge) {
   const challenges = await readJson(challengesFile);
-  challenges[username] = challenge;
+  const now = Date.now();
+  Object.keys(challenges).forEach((name) => {
+    if (isChallengeExpired(challenges[name], now)) delete challenges[name];
+  });
+  challenges[username] = { value: challenge, ts: now };
   await writeJson(challengesFile, challenges);
 }
 
 export async function popChallenge(username) {
   const challenges = await readJson(challengesFile);
-  const value = challenges[username];
-  if (value) {
-    delete challenges[username];
-    await writeJson(challengesFile, challenges);
-  }
-  return value;
+  const entry = challenges[username];
+  if (!entry) return undefined;
+  delete challenges[username];
+  await writeJson(challengesFile, challenges);
+  if (isChallengeExpired(entry)) return undefined;
+  return entry.value;
 }